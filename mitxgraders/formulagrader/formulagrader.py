@@ -1,12 +1,13 @@
 """
 formulagrader.py
 """
+from contextlib import contextmanager
 from numbers import Number
 from voluptuous import Schema, Required, Any, All, Invalid, Length
 from mitxgraders.comparers import equality_comparer
 from mitxgraders.sampling import schema_user_functions_no_random, DependentSampler
 from mitxgraders.baseclasses import ItemGrader
-from mitxgraders.helpers.calc import evaluator, DEFAULT_VARIABLES
+from mitxgraders.helpers.calc import evaluator, parse, DEFAULT_VARIABLES
 from mitxgraders.helpers.validatorfuncs import NonNegative, PercentageString, is_callable_with_args
 from mitxgraders.helpers.math_helpers import MathMixin
 from mitxgraders.helpers.calc.mathfuncs import merge_dicts
@@ -125,6 +126,34 @@ class FormulaGrader(ItemGrader, MathMixin):
         """
         cls.set_default_comparer(equality_comparer)
 
+    @classmethod
+    @contextmanager
+    def use_default_comparer(cls, comparer):
+        """
+        A context manager that temporarily sets the default_comparer, restoring
+        the previous default afterwards (rather than equality_comparer, as
+        reset_default_comparer does).
+
+        Usage
+        =====
+        >>> from mitxgraders.comparers import LinearComparer
+        >>> with FormulaGrader.use_default_comparer(LinearComparer()):
+        ...     grader = FormulaGrader(answers='pi')
+        >>> grader(None, '2*pi')['grade_decimal']
+        0.5
+        >>> FormulaGrader.default_comparer is equality_comparer
+        True
+        """
+        previous = cls.__dict__.get('default_comparer')
+        cls.set_default_comparer(comparer)
+        try:
+            yield
+        finally:
+            if previous is None:
+                del cls.default_comparer
+            else:
+                cls.default_comparer = previous
+
     @staticmethod
     def eval_and_validate_comparer_params(scoped_eval, comparer_params):
         """
@@ -147,6 +176,39 @@ class FormulaGrader(ItemGrader, MathMixin):
 
         return comparer_params_eval
 
+    @staticmethod
+    def comparer_params_are_constant(comparer_params, var_samples, func_samples):
+        """
+        Determine whether the comparer_params evaluate identically on every sample,
+        which is the case when they use no random functions and only variables
+        (such as constants) that take the same value in every sample.
+
+        Usage
+        =====
+        >>> var_samples = [{'pi': 3.14, 'x': 1.0}, {'pi': 3.14, 'x': 2.0}]
+        >>> FormulaGrader.comparer_params_are_constant(['2*pi'], var_samples, [{}, {}])
+        True
+        >>> FormulaGrader.comparer_params_are_constant(['pi*x'], var_samples, [{}, {}])
+        False
+        >>> FormulaGrader.comparer_params_are_constant(['f(pi)'], var_samples,
+        ...                                            [{'f': abs}, {'f': abs}])
+        False
+        >>> FormulaGrader.comparer_params_are_constant(['', '1'], var_samples, [{}, {}])
+        True
+        """
+        for param in comparer_params:
+            # Empty parameters evaluate to nan, whatever the sample
+            if param is None or param.strip() == '':
+                continue
+            parsed = parse(param)
+            if any(func in func_samples[0] for func in parsed.functions_used):
+                return False
+            for var in parsed.variables_used:
+                value = var_samples[0].get(var)
+                if any(sample.get(var) is not value for sample in var_samples[1:]):
+                    return False
+        return True
+
     # Configuration
 
     @property
@@ -154,13 +216,12 @@ class FormulaGrader(ItemGrader, MathMixin):
         """Define the configuration options for FormulaGrader"""
         # Construct the default ItemGrader schema
         schema = super(FormulaGrader, self).schema_config
-        # Apply the default math schema
-        schema = schema.extend(self.math_config_options)
-        # Append FormulaGrader-specific options
-        return schema.extend({
+        # Apply the default math schema and FormulaGrader-specific options together,
+        # as each call to extend recompiles the whole schema
+        return schema.extend(merge_dicts(self.math_config_options, {
             Required('allow_inf', default=False): bool,
             Required('max_array_dim', default=0): NonNegative(int)  # Do not use this; use MatrixGrader instead
-        })
+        }))
 
     schema_expect = Schema({
         Required('comparer_params'): [str],
@@ -288,6 +349,10 @@ class FormulaGrader(ItemGrader, MathMixin):
                 var_blacklist.append(var)
         var_blacklist += sibling_vars
 
+        # Comparer parameters such as answers='pi' need only be evaluated once
+        params_are_constant = self.comparer_params_are_constant(comparer_params,
+                                                                var_samples, func_samples)
+
         for i in range(self.config['samples']):
             # Update the functions and variables listings with this sample
             funclist.update(func_samples[i])
@@ -302,7 +367,11 @@ class FormulaGrader(ItemGrader, MathMixin):
                                  allow_inf=self.config['allow_inf'])
 
             # Compute expressions
-            comparer_params_eval = self.eval_and_validate_comparer_params(scoped_eval, comparer_params)
+            if params_are_constant and comparer_params_evals:
+                comparer_params_eval = list(comparer_params_evals[0])
+            else:
+                comparer_params_eval = self.eval_and_validate_comparer_params(scoped_eval,
+                                                                              comparer_params)
             comparer_params_evals.append(comparer_params_eval)
 
             # Before performing student evaluation, scrub the sibling and instructor
@@ -503,12 +503,12 @@ class IntegralGrader(SummationGraderBase):
             raise IntegrationError('Integration limits must be real but have evaluated '
                                    'to complex numbers.')
 
+        # Parse the integrand once, rather than at every point the integrator samples
+        integrand_expr = parse(integrand_str)
+
         def raw_integrand(x):
             varscope[integration_var] = x
-            value, _ = evaluator(integrand_str,
-                                 variables=varscope,
-                                 functions=funcscope,
-                                 suffixes=self.suffixes)
+            value, _ = integrand_expr.eval(varscope, funcscope, self.suffixes)
             return value
 
         # lazy load this module for performance reasons
@@ -770,16 +770,16 @@ class SumGrader(SummationGraderBase):
         if abs(upper) != float('inf') and int(upper) != upper:
             raise SummationError('Upper summation limit does not evaluate to an integer.')
 
+        # Parse the summand once, rather than for every term of the sum
+        summand_expr = parse(summand_str)
+
         def eval_summand(x):
             """
             Helper function to evaluate the summand at the given value of the
             summation variable.
             """
             varscope[summation_var] = x
-            value, _ = evaluator(summand_str,
-                                 variables=varscope,
-                                 functions=funcscope,
-                                 suffixes=self.suffixes)
+            value, _ = summand_expr.eval(varscope, funcscope, self.suffixes)
             del varscope[summation_var]
             return value
 
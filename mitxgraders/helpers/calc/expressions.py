@@ -44,25 +44,22 @@ purposes.
 """
 
 
+import cmath
 import copy
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
 import numpy as np
 from pyparsing import (
-    CaselessLiteral,
-    Combine,
     Forward,
     Group,
     Literal,
     Optional,
     ParseResults,
+    Regex,
     Suppress,
     Word,
-    FollowedBy,
     ZeroOrMore,
-    alphanums,
     alphas,
-    nums,
     stringEnd,
     ParseException,
     delimitedList
@@ -305,10 +302,18 @@ class MathParser(object):
     >>> parsed = new_parser.parse('2*x + 5')
     >>> isinstance(parsed, MathExpression)
     True
+
+    The cache is least-recently-used and holds at most cache_size entries,
+    so that a long-running process does not accumulate every formula it sees:
+    >>> new_parser.parse('2 * x + 5') is parsed
+    True
     """
 
+    # Maximum number of parsed expressions retained in the cache
+    cache_size = 4096
+
     def __init__(self):
-        self.cache = {}
+        self.cache = OrderedDict()
         self.grammar = self.get_grammar()
 
         # Internal storage that is reset at the end of calls to MathParser.parse
@@ -377,13 +382,13 @@ class MathParser(object):
         minus = Literal("-") | emdash
         plus_minus = plus | minus
 
-        # 1 or 1.0 or .1
-        number_part = Word(nums)
-        inner_number = Combine((number_part + Optional("." + Optional(number_part)))
-                               |
-                               ("." + number_part))
-        # Combine() joints the matching parts together in a single token,
-        # and requires that the matching parts be contiguous (no spaces)
+        # 1 or 1.0 or .1, with an optional exponent like E5 or e-5 (where the
+        # minus sign may be an emdash).
+        # A single Regex is many times faster than the equivalent Combine() of
+        # Words and Literals. Like Combine(), it produces a single token, and
+        # requires that the matching parts be contiguous (no spaces).
+        inner_number = Regex(r"(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[Ee][+\-\u2014]?[0-9]+)?")
+        inner_number.setParseAction(lambda tokens: tokens[0].replace("\u2014", "-"))
 
         # Define our suffixes
         suffix = Word(alphas + '%')
@@ -396,10 +401,7 @@ class MathParser(object):
         # Spaces are ignored inside numbers
         # Group wraps everything up into its own ParseResults object when parsing
         number = Group(
-            Combine(
-                inner_number +
-                Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part),
-            )("num")
+            inner_number("num")
             + Optional(suffix)("suffix")
         )("number")
         # Note that calling ("name") on the end of a parser is equivalent to calling
@@ -407,10 +409,12 @@ class MathParser(object):
         # expression like a dictionary.
 
         # Construct variable and function names
-        front = Word(alphas, alphanums)  # must start with alpha
-        subscripts = Word(alphanums + '_') + ~FollowedBy('{')  # ~ = not
-        lower_indices = Literal("_{") + Optional("-") + Word(alphanums) + Literal("}")
-        upper_indices = Literal("^{") + Optional("-") + Word(alphanums) + Literal("}")
+        front = "[A-Za-z][A-Za-z0-9]*"  # must start with alpha
+        # Like pyparsing's Word, subscripts must consume every alphanumeric and
+        # underscore available, and then not be followed by '{'
+        subscripts = r"[A-Za-z0-9_]+(?![A-Za-z0-9_{])"
+        lower_indices = r"_\{-?[A-Za-z0-9]+\}"
+        upper_indices = r"\^\{-?[A-Za-z0-9]+\}"
         # Construct an object name in either of two forms:
         #   1. front + subscripts + tail
         #   2. front + lower_indices + upper_indices + tail
@@ -425,11 +429,8 @@ class MathParser(object):
         #       Of form "^{(-)<alphanumeric>}"
         #   tail (optional):
         #       any number of primes
-        name = Combine(front +
-                       Optional(subscripts |
-                                (Optional(lower_indices) + Optional(upper_indices))
-                                ) +
-                       ZeroOrMore("'"))
+        name = Regex("{front}(?:{subscripts}|(?:{lower})?(?:{upper})?)'*".format(
+            front=front, subscripts=subscripts, lower=lower_indices, upper=upper_indices))
         # Define a variable as a pyparsing result that contains one object name
         variable = Group(name("varname"))("variable")
         variable.setParseAction(self.variable_parse_action)
@@ -517,8 +518,14 @@ class MathParser(object):
         """
         expression_no_whitespace = expression.replace(' ', '')
         cache_key = expression_no_whitespace
-        if expression_no_whitespace in self.cache:
-            return self.cache[cache_key]
+        # Look up the cache only once, as another thread may evict the entry
+        # between checking for it and reading it
+        try:
+            parsed = self.cache[cache_key]
+            self.cache.move_to_end(cache_key)
+            return parsed
+        except KeyError:
+            pass
 
         try:
             parsed = self.raw_parse(expression_no_whitespace)
@@ -526,6 +533,8 @@ class MathParser(object):
             msg = "Invalid Input: Could not parse '{}' as a formula"
             raise UnableToParse(msg.format(expression))
 
+        if len(self.cache) >= self.cache_size:
+            self.cache.popitem(last=False)
         self.cache[cache_key] = parsed
         return parsed
 
@@ -722,9 +731,11 @@ class MathExpression(object):
         Delegates to one of the provided actions, passing evaluated child nodes as arguments.
         """
 
-        if not isinstance(node, ParseResults):
-            # We have a leaf, do not recurse. Return it directly.
-            # Entry is either a (python) number or a string.
+        if type(node) is str:
+            # We have a leaf (a number, name or operator), do not recurse.
+            return node
+        if not isinstance(node, ParseResults):  # pragma: no cover
+            # Any other leaf is returned directly.
             return cast_np_numeric_as_builtin(node)
 
         node_name = node.getName()
@@ -733,8 +744,8 @@ class MathExpression(object):
 
         evaluated_children = [MathExpression.eval_node(child, actions, allow_inf) for child in node]
 
-        # Check for nan
-        if any(np.isnan(item) for item in evaluated_children if isinstance(item, float)):
+        # Check for nan (the only float that is not equal to itself)
+        if any(item != item for item in evaluated_children if isinstance(item, float)):
             return float('nan')
 
         # Compute the result of this node
@@ -745,6 +756,16 @@ class MathExpression(object):
         # (Only self.actions['arguments'] returns a list.)
         as_list = result if isinstance(result, list) else [result]
 
+        # Most nodes evaluate to plain python scalars, which cmath checks far
+        # more cheaply than numpy does
+        if all(type(r) in (float, complex) for r in as_list):
+            if not allow_inf and any(map(cmath.isinf, as_list)):
+                raise CalcOverflowError("Numerical overflow occurred. Does your expression "
+                                        "generate very large numbers?")
+            if any(map(cmath.isnan, as_list)):
+                return float('nan')
+            return result
+
         # Check if there were any infinities or nan
         if not allow_inf and any(np.any(np.isinf(r)) for r in as_list):
             raise CalcOverflowError("Numerical overflow occurred. Does your expression "
@@ -14,6 +14,7 @@ Defines:
 """
 
 
+import math
 from numbers import Number
 import numpy as np
 from mitxgraders.helpers.calc.specify_domain import SpecifyDomain
@@ -389,6 +390,26 @@ def percentage_as_number(percent_str):
     """
     return float(percent_str.strip()[:-1]) * 0.01
 
+def norm(x):
+    """
+    Computes np.linalg.norm(x), bypassing numpy for python floats and complex
+    numbers. The arithmetic matches numpy's exactly, so results are identical.
+
+    Usage
+    =====
+    >>> norm(-3.0)
+    3.0
+    >>> norm(3+4j) == np.linalg.norm(3+4j)
+    True
+    >>> norm(np.array([3, 4]))
+    5.0
+    """
+    if type(x) is float:
+        return math.sqrt(x * x)
+    if type(x) is complex:
+        return math.sqrt(x.real * x.real + x.imag * x.imag)
+    return np.linalg.norm(x)
+
 def within_tolerance(x, y, tolerance):
     """
     Check that |x-y| <= tolerance with appropriate norm.
@@ -449,11 +470,11 @@ def within_tolerance(x, y, tolerance):
     # When used within graders, tolerance has already been
     # validated as a Number or PercentageString
     if isinstance(tolerance, str):
-        tolerance = np.linalg.norm(x) * percentage_as_number(tolerance)
+        tolerance = norm(x) * percentage_as_number(tolerance)
 
     difference = x - y
 
-    return np.linalg.norm(difference) <= tolerance
+    return norm(difference) <= tolerance
 
 def is_nearly_zero(x, tolerance, reference=None):
     """
@@ -499,6 +520,6 @@ def is_nearly_zero(x, tolerance, reference=None):
         if reference is None:
             raise ValueError('When tolerance is a percentage, reference must '
                 'not be None.')
-        tolerance = np.linalg.norm(reference) * percentage_as_number(tolerance)
+        tolerance = norm(reference) * percentage_as_number(tolerance)
 
-    return np.linalg.norm(x) <= tolerance
+    return norm(x) <= tolerance
@@ -102,17 +102,18 @@ def validate_forbidden_strings_not_used(expr, forbidden_strings, forbidden_msg):
     ...     print(error)
     A forbidden string was used!
     """
+    if not forbidden_strings:
+        return True
     if isinstance(expr, dict):
         expr = [v for k, v in expr.items()]
     elif not isinstance(expr, list):
         expr = [expr]
+    check_for = [forbidden.replace(' ', '') for forbidden in forbidden_strings]
     for expression in expr:
         stripped_expr = expression.replace(' ', '')
-        for forbidden in forbidden_strings:
-            check_for = forbidden.replace(' ', '')
-            if check_for in stripped_expr:
-                # Don't give away the specific string that is being checked for!
-                raise InvalidInput(forbidden_msg)
+        if any(forbidden in stripped_expr for forbidden in check_for):
+            # Don't give away the specific string that is being checked for!
+            raise InvalidInput(forbidden_msg)
     return True
 
 def validate_only_permitted_functions_used(used_funcs, permitted_functions):
@@ -585,15 +586,17 @@ class MathMixin(object):
         bad_vars = set(var for var in vars_used if var not in variable_list)
         
         # Check to see if any unassigned variables are numbered_vars
-        regexp = numbered_vars_regexp(self.config['numbered_vars'])
-        for var in bad_vars:
-            match = regexp.match(var)  # Returns None if no match
-            if match:
-                # This variable is a numbered_variable
-                # Go and add it to variable_list with the appropriate sampler
-                (full_string, head) = match.groups()
-                variable_list.append(full_string)
-                sample_from_dict[full_string] = sample_from_dict[head]
+        # (only building the regexp when there is something for it to match)
+        if bad_vars and self.config['numbered_vars']:
+            regexp = numbered_vars_regexp(self.config['numbered_vars'])
+            for var in bad_vars:
+                match = regexp.match(var)  # Returns None if no match
+                if match:
+                    # This variable is a numbered_variable
+                    # Go and add it to variable_list with the appropriate sampler
+                    (full_string, head) = match.groups()
+                    variable_list.append(full_string)
+                    sample_from_dict[full_string] = sample_from_dict[head]
 
         return variable_list, sample_from_dict
     
@@ -33,7 +33,7 @@ from mitxgraders.helpers.validatorfuncs import (
     Positive, NumberRange, ListOfType, TupleOfType, is_callable,
     has_keys_of_type, Nullable)
 from mitxgraders.helpers.calc import (
-    METRIC_SUFFIXES, CalcError, evaluator, parse, MathArray)
+    METRIC_SUFFIXES, CalcError, parse, MathArray)
 
 # Set the objects to be imported from this grader
 __all__ = [
@@ -331,6 +331,8 @@ class RandomFunction(FunctionSamplingSet):  # pylint: disable=too-few-public-met
         B = 2 * np.pi * (np.random.rand(output_dim, num_terms, input_dim) - 0.5)
         # Phases C range from 0 to 2*pi
         C = 2 * np.pi * np.random.rand(output_dim, num_terms, input_dim)
+        amplitude = self.config["amplitude"]
+        center = self.config["center"]
 
         def random_function(*args):
             """Function that generates the random values"""
@@ -339,20 +341,19 @@ class RandomFunction(FunctionSamplingSet):  # pylint: disable=too-few-public-met
                 msg = "Expected {} arguments, but received {}".format(input_dim, len(args))
                 raise ConfigError(msg)
 
-            # Turn the inputs into an array
+            # Turn the inputs into an array, which broadcasts against the
+            # last (input_dim) axis of A, B and C
             xvec = np.array(args)
-            # Repeat it into the shape of A, B and C
-            xarray = np.tile(xvec, (output_dim, num_terms, 1))
             # Compute the output matrix
-            output = A * np.sin(B * xarray + C)
+            output = A * np.sin(B * xvec + C)
             # Sum over the j and k terms
             # We have an old version of numpy going here, so we can't use
             # fullsum = np.sum(output, axis=(1, 2))
             fullsum = np.sum(np.sum(output, axis=2), axis=1)
 
             # Scale and translate to fit within center and amplitude
-            fullsum = fullsum * self.config["amplitude"] / self.config["num_terms"]
-            fullsum += self.config["center"]
+            fullsum = fullsum * amplitude / num_terms
+            fullsum += center
 
             # Return the result
             return MathArray(fullsum) if output_dim > 1 else fullsum[0]
@@ -414,9 +415,10 @@ class DependentSampler(VariableSamplingSet):
         super(DependentSampler, self).__init__(config, **kwargs)
 
         # Construct the 'depends' list (overwrites whatever was provided, as this does it better!)
+        # Keep the parsed formula, so that computing samples need not look it up again
         try:
-            parsed = parse(self.config['formula'])
-            self.config['depends'] = list(parsed.variables_used)
+            self.parsed = parse(self.config['formula'])
+            self.config['depends'] = list(self.parsed.variables_used)
         except CalcError:
             raise ConfigError("Formula error in dependent sampling formula: " +
                               self.config["formula"])
@@ -428,10 +430,7 @@ class DependentSampler(VariableSamplingSet):
     def compute_sample(self, sample_dict, functions, suffixes):
         """Compute the value of this sample"""
         try:
-            result, _ = evaluator(formula=self.config['formula'],
-                                  variables=sample_dict,
-                                  functions=functions,
-                                  suffixes=suffixes)
+            result, _ = self.parsed.eval(sample_dict, functions, suffixes)
         except CalcError:
             raise ConfigError("Formula error in dependent sampling formula: " +
                               self.config["formula"])
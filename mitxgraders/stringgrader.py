@@ -5,14 +5,104 @@ Class for grading inputs that correspond to a text string
 * StringGrader
 """
 import re
+from collections import OrderedDict
 from voluptuous import Required, Any
 from mitxgraders.baseclasses import ItemGrader
 from mitxgraders.helpers.validatorfuncs import NonNegative
 from mitxgraders.exceptions import InvalidInput, ConfigError
 
+# Google's RE2 engine is optional
+try:
+    import re2
+except ImportError:  # pragma: no cover
+    re2 = None
+
 # Set the objects to be imported from this grader
 __all__ = ["StringGrader"]
 
+# Used to collapse runs of spaces into a single space
+MULTISPACE_RE = re.compile(r' +')
+
+# Used to convert tabs and newline characters into spaces in a single pass
+WHITESPACE_TABLE = str.maketrans({'\t': ' ', '\r': ' ', '\n': ' '})
+
+# Matches the \d, \w, \s and \b classes (and their negations) in a regex pattern,
+# skipping escaped backslashes. Python's re matches these against unicode, but RE2
+# only matches them against ASCII.
+UNICODE_CLASSES_RE = re.compile(r'(?<!\\)(?:\\\\)*\\[dDwWsSbB]')
+
+def compile_pattern(pattern):
+    """
+    Compiles a regex pattern.
+
+    If Google's RE2 engine is installed (the optional google-re2 package), it is
+    used to compile the pattern, as it matches in linear time and can't be made to
+    backtrack catastrophically by student input. Patterns that RE2 doesn't
+    support (backreferences, lookarounds, etc) fall back to python's re module,
+    as does everything when RE2 is unavailable. So do patterns using \\d, \\w,
+    \\s or \\b, so that they keep matching unicode characters just as they do in re.
+    """
+    if re2 is None or UNICODE_CLASSES_RE.search(pattern):
+        return re.compile(pattern)
+
+    try:
+        return re2.compile(pattern)
+    except re2.error:
+        return re.compile(pattern)
+
+# Characters with special meaning in regex patterns
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+def simple_pattern_matcher(testpattern):
+    """
+    Looks for common validation patterns that can be checked without using
+    regular expressions. If testpattern is one of these, returns a function
+    that takes a string and returns whether re.match(testpattern, string) would
+    succeed. Otherwise, returns None. Strings are assumed to contain no newlines.
+
+    Recognized patterns are anchored at the end, and consist of a literal string,
+    a choice between literal strings in parentheses, or a run of digits.
+
+    >>> simple_pattern_matcher('cat$')('cat')
+    True
+    >>> simple_pattern_matcher('^(?:yes|no)$$')('no')
+    True
+    >>> simple_pattern_matcher(r'[0-9]+$')('0123')
+    True
+    >>> simple_pattern_matcher(r'[0-9]+$')('12a')
+    False
+    >>> simple_pattern_matcher(r'ca+t$') is None
+    True
+    >>> simple_pattern_matcher(r'cat^') is None
+    True
+    """
+    def is_literal(text):
+        """Whether text contains no special characters"""
+        return not any(char in REGEX_METACHARACTERS for char in text)
+
+    # The pattern must be anchored at the end (the start is anchored by re.match)
+    if not testpattern.endswith('$'):
+        return None
+    body = testpattern[:-1]
+    if body.startswith('^'):
+        body = body[1:]
+    if body.endswith('$') and not body.endswith('\\$'):
+        body = body[:-1]
+
+    if is_literal(body):
+        return body.__eq__
+    if body == r'\d+':
+        # \d matches any unicode decimal digit
+        return str.isdecimal
+    if body == r'[0-9]+':
+        return lambda string: string.isascii() and string.isdecimal()
+    for prefix in ('(?:', '('):
+        if body.startswith(prefix) and body.endswith(')'):
+            options = body[len(prefix):-1].split('|')
+            if all(is_literal(option) for option in options):
+                return frozenset(options).__contains__
+    return None
+
 class StringGrader(ItemGrader):
     """
     Grader based on exact comparison of strings
@@ -67,6 +157,15 @@ class StringGrader(ItemGrader):
             (default 'Your input is not in the expected format')
     """
 
+    # The result for an incorrect response (copy before use)
+    wrong_response = {'ok': False, 'grade_decimal': 0, 'msg': ''}
+
+    # Maximum number of cleaned answers to remember
+    expect_cache_size = 256
+
+    # Maximum number of grading results to remember
+    result_cache_size = 1024
+
     @property
     def schema_config(self):
         """Define the configuration options for StringGrader"""
@@ -88,6 +187,82 @@ class StringGrader(ItemGrader):
             Required('invalid_msg', default='Your input is not in the expected format'): str
             })
 
+    def validate_config(self, config):
+        """
+        Validate the StringGrader's configuration, then work out the settings
+        that are derived from it. This happens here rather than in __init__, as
+        ItemGrader.__init__ checks the answers with post_schema_ans_val straight
+        after validation, and that needs the compiled validation pattern.
+
+        The validation pattern (if any) is compiled here so that it isn't
+        recompiled on every grading call.
+        """
+        config = super(StringGrader, self).validate_config(config)
+
+        # Figure out if we are accepting any input, and the resulting minimum length
+        self.accept_any = config['accept_any'] or config['accept_nonempty']
+        self.min_length = config['min_length']
+        if config['accept_nonempty'] and self.min_length == 0:
+            self.min_length = 1
+
+        # Make sure that the pattern matches the entire input
+        pattern = config['validation_pattern']
+        if pattern is None:
+            self.validation_re = None
+        else:
+            testpattern = pattern if pattern.endswith("^") else pattern + "$"
+            try:
+                self.validation_re = compile_pattern(testpattern)
+            except re.error as error:
+                msg = "Unable to compile the validation pattern '{}': {}"
+                raise ConfigError(msg.format(pattern, error))
+
+            # Simple patterns can be checked without using the regex engine
+            self.matches_pattern = simple_pattern_matcher(testpattern)
+            if self.matches_pattern is None:
+                self.matches_pattern = self.matches_validation_re
+
+        # Determine if there is nothing at all to check in a response
+        self.accept_everything = (self.accept_any
+                                  and self.validation_re is None
+                                  and self.min_length == 0
+                                  and config['min_words'] == 0)
+
+        return config
+
+    def __init__(self, config=None, **kwargs):
+        """
+        Validate the StringGrader's configuration (see validate_config), then set
+        up caches of cleaned answers and grading results.
+        """
+        super(StringGrader, self).__init__(config, **kwargs)
+
+        # Answers rarely change between calls, so remember their cleaned forms
+        self.cleaned_expect_cache = {}
+
+        # Remember the results of grading, keyed by answer and student input
+        # Least recently used results are discarded first
+        self.result_cache = OrderedDict()
+
+    def matches_validation_re(self, string):
+        """Whether the string satisfies the compiled validation pattern"""
+        return self.validation_re.match(string) is not None
+
+    def post_schema_ans_val(self, answer_tuple):
+        """
+        Make sure that every answer matches the validation pattern, as otherwise a
+        student can never get the problem right. Answers are irrelevant when
+        accepting any input.
+        """
+        if self.validation_re is not None and not self.accept_any:
+            for answer in answer_tuple:
+                for expect in answer['expect']:
+                    if not self.matches_pattern(self.clean_input(expect)):
+                        msg = ("The provided answer '{}' does not match the "
+                               "validation pattern '{}'")
+                        raise ConfigError(msg.format(expect, self.config['validation_pattern']))
+        return answer_tuple
+
     def clean_input(self, input):
         """
         Performs cleaning operations on the given input, according to
@@ -95,30 +270,64 @@ class StringGrader(ItemGrader):
 
         Also converts tabs and newlines spaces for the purpose of grading.
         """
-        cleaned = str(input)
+        # Inputs are almost always strings already
+        cleaned = input if type(input) is str else str(input)
 
         # Convert \t and newline characters (\r and \n) to spaces
         # Note: there is no option for this conversion
-        cleaned = cleaned.replace('\t', ' ')
-        cleaned = cleaned.replace('\r\n', ' ')
-        cleaned = cleaned.replace('\n\r', ' ')
-        cleaned = cleaned.replace('\r', ' ')
-        cleaned = cleaned.replace('\n', ' ')
+        # Most inputs are a single line, so only translate when necessary
+        if '\t' in cleaned or '\r' in cleaned or '\n' in cleaned:
+            # Two-character line breaks become a single space, so handle them first
+            if '\r' in cleaned:
+                cleaned = cleaned.replace('\r\n', ' ')
+                cleaned = cleaned.replace('\n\r', ' ')
+            cleaned = cleaned.translate(WHITESPACE_TABLE)
+
+        # Apply strip_all, clean_spaces and strip
+        # Stripping last means it only has to trim single spaces from the ends,
+        # and gives the same result as stripping first
+        if self.config['strip_all']:
+            cleaned = cleaned.replace(' ', '')
+        elif self.config['clean_spaces'] and '  ' in cleaned:
+            cleaned = MULTISPACE_RE.sub(' ', cleaned)
+        if self.config['strip']:
+            cleaned = cleaned.strip()
 
         # Apply case sensitivity
+        # This is done last, so that we only lowercase what remains after stripping
         if not self.config['case_sensitive']:
             cleaned = cleaned.lower()
 
-        # Apply strip, strip_all and clean_spaces
-        if self.config['strip']:
-            cleaned = cleaned.strip()
-        if self.config['strip_all']:
-            cleaned = cleaned.replace(' ', '')
-        if self.config['clean_spaces']:
-            cleaned = re.sub(r' +', ' ', cleaned)
-
         return cleaned
 
+    def compare_form(self, cleaned):
+        """
+        Returns the form of cleaned text that is compared against answers.
+
+        For case-insensitive grading, the cleaned text is casefolded so that, e.g.,
+        'ß' compares equal to 'SS'. As casefolding can change the length of the
+        text, it is only applied to the strings being compared; minimum lengths
+        and the validation pattern are checked against the cleaned text.
+        """
+        if self.config['case_sensitive']:
+            return cleaned
+        return cleaned.casefold()
+
+    def clean_expect(self, expect):
+        """
+        Returns the cleaned version of an expected answer, in the form used for
+        comparisons, caching the result.
+        Answers are usually the same from call to call, so this saves cleaning
+        them over and over.
+        """
+        cache = self.cleaned_expect_cache
+        if expect not in cache:
+            # Keep the cache small if answers are being inferred on every call
+            if len(cache) >= self.expect_cache_size:
+                cache.clear()
+            cache[expect] = self.compare_form(self.clean_input(expect))
+        return cache[expect]
+
     def construct_message(self, msg, msg_type):
         """
         Depending on the configuration, construct the appropriate return dictionary
@@ -128,10 +337,10 @@ class StringGrader(ItemGrader):
             msg: Message to return if a message should be returned
             msg_type: Type of message to return ('err', 'msg', or None)
         """
-        invalid_response = {'ok': False, 'grade_decimal': 0, 'msg': ''}
         if msg_type == 'err':
             raise InvalidInput(msg)
-        elif msg_type == 'msg' or self.config['debug']:
+        invalid_response = self.wrong_response.copy()
+        if msg_type == 'msg' or self.config['debug']:
             invalid_response['msg'] = msg
         return invalid_response
 
@@ -139,58 +348,78 @@ class StringGrader(ItemGrader):
         """
         Grades a student response against a given answer
 
+        The same common responses tend to be submitted over and over, so results
+        are cached, discarding the least recently used once the cache is full.
+        Responses that raise an error are not cached.
+
+        The cache is not keyed on the grader's configuration, as StringGrader
+        works out its settings from the configuration when it is created and
+        doesn't support changing it afterwards. If self.config is modified
+        anyway, clear self.result_cache as well.
+
         Arguments:
             answer (dict): Dictionary describing the expected answer,
                            its point value, and any associated message
             student_input (str): The student's input passed by edX
         """
-        expect = self.clean_input(answer['expect'])
-        student = self.clean_input(student_input)
+        # Key on the input as a string, as that is what gets graded. Inputs such as
+        # 1, 1.0 and True are equal as keys, but not as strings.
+        key = (answer['expect'], answer['ok'], answer['grade_decimal'], answer['msg'],
+               str(student_input))
+        cache = self.result_cache
+        try:
+            result = cache[key]
+            cache.move_to_end(key)
+        except KeyError:
+            result = self.grade_response(answer, student_input)
+            if len(cache) >= self.result_cache_size:
+                cache.popitem(last=False)
+            cache[key] = result
+        # Return a copy, as the caller may modify the result
+        return result.copy()
+
+    def grade_response(self, answer, student_input):
+        """
+        Grades a student response against a given answer without caching.
+        Arguments are as for check_response.
+        """
+        # If every response is acceptable, there's nothing to clean or check
+        if self.accept_everything:
+            return self.correct_response(answer)
 
-        # Figure out if we are accepting any input
-        accept_any = self.config['accept_any'] or self.config['accept_nonempty']
-        min_length = self.config['min_length']
-        if self.config['accept_nonempty'] and min_length == 0:
-            min_length = 1
+        student = self.clean_input(student_input)
+        # The expected answer only matters if we aren't accepting any input
+        expect = None if self.accept_any else self.clean_expect(answer['expect'])
 
         # Apply the validation pattern
-        pattern = self.config['validation_pattern']
-        if pattern is not None:
-            # Make sure that the pattern matches the entire input
-            testpattern = pattern
-            if not pattern.endswith("^"):
-                testpattern += "$"
-
-            if not accept_any:
-                # Make sure that expect matches the pattern
-                # If it doesn't, a student can never get this right
-                if re.match(testpattern, expect) is None:
-                    msg = "The provided answer '{}' does not match the validation pattern '{}'"
-                    raise ConfigError(msg.format(answer['expect'], pattern))
-
+        # Note that answers were checked against the pattern by post_schema_ans_val
+        if self.validation_re is not None:
             # Check to see if the student input matches the validation pattern
-            if re.match(testpattern, student) is None:
+            if not self.matches_pattern(student):
                 return self.construct_message(self.config['invalid_msg'],
                                               self.config['explain_validation'])
 
         # Perform the comparison
-        if not accept_any:
+        if not self.accept_any:
             # Check for a match to expect
-            if student != expect:
-                return {'ok': False, 'grade_decimal': 0, 'msg': ''}
+            if self.compare_form(student) != expect:
+                return self.wrong_response.copy()
         else:
             # Check for the minimum length
             msg = None
             chars = len(student)
-            if chars < min_length:
+            if chars < self.min_length:
                 msg = ('Your response is too short ({chars}/{min} characters)'
-                       ).format(chars=chars, min=min_length)
+                       ).format(chars=chars, min=self.min_length)
 
             # Check for minimum word count (more important than character count)
-            words = len(student.split())
-            if words < self.config['min_words']:
-                msg = ('Your response is too short ({words}/{min} words)'
-                       ).format(words=words, min=self.config['min_words'])
+            # Only count words if a minimum has been set
+            min_words = self.config['min_words']
+            if min_words:
+                words = len(student.split())
+                if words < min_words:
+                    msg = ('Your response is too short ({words}/{min} words)'
+                           ).format(words=words, min=min_words)
 
             # Give student feedback
             if msg:
@@ -198,6 +427,11 @@ class StringGrader(ItemGrader):
                                               self.config['explain_minimums'])
 
         # If we got here, everything is correct
+        return self.correct_response(answer)
+
+    @staticmethod
+    def correct_response(answer):
+        """Constructs the return dictionary for a response that matches answer"""
         return {
             'ok': answer['ok'],
             'grade_decimal': answer['grade_decimal'],
@@ -209,7 +443,7 @@ class StringGrader(ItemGrader):
         The same as ItemGrader.__call__, except that we accept a None
         entry for expect if accept_any or accept_nonempty are set.
         """
-        if expect is None and (self.config['accept_any'] or self.config['accept_nonempty']):
+        if expect is None and self.accept_any:
             expect = ""
 
         return super(StringGrader, self).__call__(expect, student_input, **kwargs)
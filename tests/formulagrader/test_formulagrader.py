@@ -3,7 +3,7 @@ Tests for FormulaGrader and NumericalGrader
 """
 
 
-from pytest import raises
+from pytest import raises, fixture, mark, param
 import platform
 from unittest import mock
 import numpy as np
@@ -31,20 +31,22 @@ from mitxgraders import ListGrader
 from mitxgraders.comparers import equality_comparer
 from tests.helpers import log_results, round_decimals_in_string
 
-def test_square_root_of_negative_number():
-    grader = FormulaGrader(
-        answers='2*i'
+@fixture(scope='module')
+def grader_2i():
+    """A FormulaGrader expecting 2*i, shared by the tests in this module"""
+    return FormulaGrader(
+        answers='2*i',
+        samples=1
     )
-    assert grader(None, 'sqrt(-4)')['ok']
 
-def test_half_power_of_negative_number():
-    grader = FormulaGrader(
-        answers='2*i'
-    )
-    assert grader(None, '(-4)^0.5')['ok']
+def test_square_root_of_negative_number(grader_2i):
+    assert grader_2i(None, 'sqrt(-4)')['ok']
+
+def test_half_power_of_negative_number(grader_2i):
+    assert grader_2i(None, '(-4)^0.5')['ok']
 
 def test_factorial():
-    grader = FormulaGrader(answers='0')
+    grader = FormulaGrader(answers='0', samples=1)
     expect = (r"Error evaluating factorial\(\) or fact\(\) in input. "
               r"These functions cannot be used at negative integer values.")
 
@@ -61,7 +63,8 @@ def test_overriding_functions():
     grader = FormulaGrader(
         answers='tan(1)',
         user_functions={'sin': lambda x: x},
-        suppress_warnings=True
+        suppress_warnings=True,
+        samples=1
     )
     assert grader(None, 'tan(1)')['ok']
     assert not grader(None, 'sin(1)/cos(1)')['ok']
@@ -70,97 +73,96 @@ def test_fg_expressions():
     """General test of FormulaGrader"""
     grader = FormulaGrader(
         answers="1+tan(3/2)",
-        tolerance="0.1%"
+        tolerance="0.1%",
+        samples=1
     )
     assert grader(None, "(cos(3/2) + sin(3/2))/cos(3/2 + 2*pi)")['ok']
     # Checking tolerance
     assert grader(None, "0.01+(cos(3/2) + sin(3/2))/cos(3/2 + 2*pi)")['ok']
     assert not grader(None, "0.02+(cos(3/2) + sin(3/2))/cos(3/2 + 2*pi)")['ok']
 
-def test_fg_invalid_input():
-    grader = FormulaGrader(answers='2', variables=['m'])
-
-    expect = "Invalid Input: 'pi' not permitted in answer as a function " + \
-             r'\(did you forget to use \* for multiplication\?\)'
-    with raises(CalcError, match=expect):
-        grader(None, "pi(3)")
-
-    expect = "Invalid Input: 'Im', 'Re' not permitted in answer as a function " + \
-             r"\(did you mean 'im', 're'\?\)"
-    with raises(CalcError, match=expect):
-        grader(None, "Im(3) + Re(2)")
-
-    expect = "Invalid Input: 'spin' not permitted in answer as a function"
-    with raises(CalcError, match=expect):
-        grader(None, "spin(3)")
-
-    expect = "Invalid Input: 'R' not permitted in answer as a variable"
-    with raises(CalcError, match=expect):
-        grader(None, "R")
-
-    expect = "Invalid Input: 'Q', 'R' not permitted in answer as a variable"
-    with raises(CalcError, match=expect):
-        grader(None, "R+Q")
-
-    expect = "Invalid Input: 'pp' not permitted directly after a number"
-    with raises(CalcError, match=expect):
-        grader(None, "5pp")
-
-    expect = "Invalid Input: 'mm', 'pp' not permitted directly after a number"
-    with raises(CalcError, match=expect):
-        grader(None, "5pp+6mm")
-
-    expect = (r"Invalid Input: 'm' not permitted directly after a number "
-              r"\(did you forget to use \* for multiplication\?\)")
-    with raises(CalcError, match=expect):
-        grader(None, "5m")
-
-    expect = (r"There was an error evaluating csc\(...\). "
-              r"Its input does not seem to be in its domain.")
-    with raises(CalcError, match=expect):
-        grader(None, 'csc(0)')
-
-    expect = r"There was an error evaluating sinh\(...\). \(Numerical overflow\)."
-    with raises(CalcError, match=expect):
-        grader(None, 'sinh(10000)')
-
-    expect = (r"There was an error evaluating arccosh\(...\). "
-              r"Its input does not seem to be in its domain.")
+@fixture(scope='module')
+def grader_2m():
+    """A FormulaGrader expecting 2 with variable m, shared by the invalid input tests"""
+    return FormulaGrader(answers='2', variables=['m'])
+
+INVALID_INPUT_CASES = [
+    param("pi(3)",
+          "Invalid Input: 'pi' not permitted in answer as a function "
+          r'\(did you forget to use \* for multiplication\?\)',
+          id='constant-as-function'),
+    param("Im(3) + Re(2)",
+          "Invalid Input: 'Im', 'Re' not permitted in answer as a function "
+          r"\(did you mean 'im', 're'\?\)",
+          id='wrong-case-functions'),
+    param("spin(3)",
+          "Invalid Input: 'spin' not permitted in answer as a function",
+          id='unknown-function'),
+    param("R",
+          "Invalid Input: 'R' not permitted in answer as a variable",
+          id='unknown-variable'),
+    param("R+Q",
+          "Invalid Input: 'Q', 'R' not permitted in answer as a variable",
+          id='unknown-variables'),
+    param("5pp",
+          "Invalid Input: 'pp' not permitted directly after a number",
+          id='unknown-suffix'),
+    param("5pp+6mm",
+          "Invalid Input: 'mm', 'pp' not permitted directly after a number",
+          id='unknown-suffixes'),
+    param("5m",
+          r"Invalid Input: 'm' not permitted directly after a number "
+          r"\(did you forget to use \* for multiplication\?\)",
+          id='variable-as-suffix'),
+    param('csc(0)',
+          r"There was an error evaluating csc\(...\). "
+          r"Its input does not seem to be in its domain.",
+          id='csc-domain'),
+    param('sinh(10000)',
+          r"There was an error evaluating sinh\(...\). \(Numerical overflow\).",
+          id='sinh-overflow'),
+    param('arccosh(0)',
+          r"There was an error evaluating arccosh\(...\). "
+          r"Its input does not seem to be in its domain.",
+          id='arccosh-domain'),
+    param('1/0',
+          "Division by zero occurred. Check your input's denominators.",
+          id='division-by-zero'),
+    param('2^10000',
+          "Numerical overflow occurred. Does your input generate very large numbers?",
+          id='overflow'),
+]
+
+@mark.parametrize('student_input, expect', INVALID_INPUT_CASES)
+def test_fg_invalid_input(grader_2m, student_input, expect):
     with raises(CalcError, match=expect):
-        grader(None, 'arccosh(0)')
-
-    expect = "Division by zero occurred. Check your input's denominators."
-    with raises(CalcError, match=expect):
-        grader(None, '1/0')
-
-    expect = "Numerical overflow occurred. Does your input generate very large numbers?"
-    with raises(CalcError, match=expect):
-        grader(None, '2^10000')
+        grader_2m(None, student_input)
+
+@fixture(scope='module')
+def tolerance_graders():
+    """FormulaGraders expecting 10, keyed by their tolerance"""
+    return {
+        tolerance: FormulaGrader(answers="10", tolerance=tolerance, samples=1)
+        for tolerance in [0.1, "1%", 0]
+    }
 
-def test_fg_tolerance():
+TOLERANCE_CASES = [
+    (tolerance, student_input, ok)
+    for tolerance in [0.1, "1%"]
+    for student_input, ok in [('9.85', False), ('9.9', True), ('10', True),
+                              ('10.1', True), ('10.15', False)]
+] + [
+    (0, '9.999999', False),
+    (0, '10', True),
+    (0, '10.000001', False),
+]
+
+@mark.parametrize('tolerance, student_input, ok', TOLERANCE_CASES)
+def test_fg_tolerance(tolerance_graders, tolerance, student_input, ok):
     """Test of FormulaGrader tolerance"""
-    grader = FormulaGrader(answers="10", tolerance=0.1)
-
-    assert not grader(None, '9.85')['ok']
-    assert grader(None, '9.9')['ok']
-    assert grader(None, '10')['ok']
-    assert grader(None, '10.1')['ok']
-    assert not grader(None, '10.15')['ok']
-
-    grader = FormulaGrader(answers="10", tolerance="1%")
-
-    assert not grader(None, '9.85')['ok']
-    assert grader(None, '9.9')['ok']
-    assert grader(None, '10')['ok']
-    assert grader(None, '10.1')['ok']
-    assert not grader(None, '10.15')['ok']
-
-    grader = FormulaGrader(answers="10", tolerance=0)
-
-    assert not grader(None, '9.999999')['ok']
-    assert grader(None, '10')['ok']
-    assert not grader(None, '10.000001')['ok']
+    assert tolerance_graders[tolerance](None, student_input)['ok'] == ok
 
+def test_fg_negative_tolerance():
     expect = (r"Cannot have a negative percentage for dictionary value @ "
               r"data\[u?'tolerance'\]. Got u?'-1%'")
     with raises(Error, match=expect):
@@ -170,7 +172,8 @@ def test_fg_userfunc():
     """Test a user function in FormulaGrader"""
     grader = FormulaGrader(
         answers="hello(2)",
-        user_functions={"hello": lambda x: x**2-1}
+        user_functions={"hello": lambda x: x**2-1},
+        samples=1
     )
     assert grader(None, "5+hello(2)-2-3")['ok']
     assert not grader(None, "hello(1)")['ok']
@@ -178,7 +181,8 @@ def test_fg_userfunc():
 def test_fg_percent():
     """Test a percentage suffix in FormulaGrader"""
     grader = FormulaGrader(
-        answers="2%"
+        answers="2%",
+        samples=1
     )
     assert grader(None, "2%")['ok']
     assert grader(None, "0.02")['ok']
@@ -189,7 +193,8 @@ def test_fg_metric():
     """Test metric suffixes in FormulaGrader"""
     grader = FormulaGrader(
         answers="0.02",
-        metric_suffixes=True
+        metric_suffixes=True,
+        samples=1
     )
     assert grader(None, "2%")['ok']
     assert grader(None, "0.02")['ok']
@@ -404,38 +409,19 @@ def test_fg_sampling():
     with raises(MultipleInvalid, match=r"extra keys not allowed @ data\[u?'w'\]"):
         grader = FormulaGrader(variables=['x'], sample_from={'w': 2})
 
+@mark.parametrize('sampler', [
+    param(ComplexSector(), id='ComplexSector'),
+    param(ComplexRectangle(), id='ComplexRectangle'),
+    param(IntegerRange(), id='IntegerRange'),
+    param(RealInterval(), id='RealInterval'),
+    param(DiscreteSet((1, 3, 5)), id='DiscreteSet'),
+])
+def test_fg_sampling_sets(sampler):
+    """Test FormulaGrader with each type of variable sampling set"""
     grader = FormulaGrader(
         answers="z^2",
         variables=['z'],
-        sample_from={'z': ComplexSector()}
-    )
-    assert grader(None, '(z-1)*(z+1)+1')['ok']
-
-    grader = FormulaGrader(
-        answers="z^2",
-        variables=['z'],
-        sample_from={'z': ComplexRectangle()}
-    )
-    assert grader(None, '(z-1)*(z+1)+1')['ok']
-
-    grader = FormulaGrader(
-        answers="z^2",
-        variables=['z'],
-        sample_from={'z': IntegerRange()}
-    )
-    assert grader(None, '(z-1)*(z+1)+1')['ok']
-
-    grader = FormulaGrader(
-        answers="z^2",
-        variables=['z'],
-        sample_from={'z': RealInterval()}
-    )
-    assert grader(None, '(z-1)*(z+1)+1')['ok']
-
-    grader = FormulaGrader(
-        answers="z^2",
-        variables=['z'],
-        sample_from={'z': DiscreteSet((1, 3, 5))}
+        sample_from={'z': sampler}
     )
     assert grader(None, '(z-1)*(z+1)+1')['ok']
 
@@ -515,25 +501,7 @@ def test_fg_config_expect():
 def squareit(x):
     return x**2
 
-def test_fg_debug_log():
-    set_seed(0)
-    grader = FormulaGrader(
-        answers='x^2 + f(y) + z',
-        variables=['x', 'y', 'z'],
-        sample_from={
-            'z': ComplexRectangle()
-        },
-        blacklist=['sin', 'cos', 'tan'],
-        user_functions={
-            'f': RandomFunction(),
-            'square': squareit
-            },
-        samples=2,
-        debug=True
-    )
-    result = grader(None, 'z + x*x + f(y)')
-
-    message = (
+FG_DEBUG_LOG_TEMPLATE = (
     "<pre>MITx Grading Library Version {version}<br/>\n"
     "Running on edX using python {python_version}<br/>\n"
     "Student Response:<br/>\n"
@@ -627,12 +595,33 @@ def test_fg_debug_log():
     "[{{'grade_decimal': 1.0, 'msg': '', 'ok': True}},<br/>\n"
     " {{'grade_decimal': 1.0, 'msg': '', 'ok': True}}]<br/>\n"
     "</pre>"
-    ).format(version=VERSION, python_version=platform.python_version())
-    message = message.replace("<func", "&lt;func").replace("...>", "...&gt;")
-    expected = round_decimals_in_string(message)
+)
+FG_DEBUG_LOG_EXPECTED = round_decimals_in_string(
+    FG_DEBUG_LOG_TEMPLATE.format(version=VERSION, python_version=platform.python_version())
+    .replace("<func", "&lt;func").replace("...>", "...&gt;")
+)
+
+def test_fg_debug_log():
+    set_seed(0)
+    grader = FormulaGrader(
+        answers='x^2 + f(y) + z',
+        variables=['x', 'y', 'z'],
+        sample_from={
+            'z': ComplexRectangle()
+        },
+        blacklist=['sin', 'cos', 'tan'],
+        user_functions={
+            'f': RandomFunction(),
+            'square': squareit
+            },
+        samples=2,
+        debug=True
+    )
+    result = grader(None, 'z + x*x + f(y)')
+
     result_msg = round_decimals_in_string(result['msg']).replace(
         'test_fg_debug_log.<locals>.', '')
-    assert expected == result_msg
+    assert FG_DEBUG_LOG_EXPECTED == result_msg
 
 def test_fg_evaluates_siblings_appropriately():
     grader=ListGrader(
@@ -766,152 +755,87 @@ def test_ng_config():
             user_functions={"f": [np.sin, np.cos]}
         )
 
-def test_docs():
+DOCS_EXAMPLES = [
+    param(dict(answers='1+x^2+y', variables=['x', 'y']),
+          '1+x^2+y', id='variables'),
+    param(dict(answers='1+x^2+y+z/2',
+               variables=['x', 'y', 'z'],
+               sample_from={
+                   'x': ComplexRectangle(),
+                   'y': [2, 6],
+                   'z': (1, 3, 4, 8)
+               }),
+          '1+x^2+y+z/2', id='sample_from'),
+    param(dict(answers='a_{0} + a_{1}*x + 1/2*a_{2}*x^2',
+               variables=['x'],
+               numbered_vars=['a'],
+               sample_from={
+                   'x': [-5, 5],
+                   'a': [-10, 10]
+               }),
+          'a_{0} + a_{1}*x + 1/2*a_{2}*x^2', id='numbered_vars'),
+    param(dict(answers='1+x^2', variables=['x'], samples=10),
+          '1+x^2', id='samples'),
+    param(dict(answers='1+x^2', variables=['x'], samples=10, failable_evals=1),
+          '1+x^2', id='failable_evals'),
+    param(dict(answers='abs(z)^2',
+               variables=['z'],
+               sample_from={
+                   'z': ComplexRectangle()
+               }),
+          'abs(z)^2', id='complex'),
+    param(dict(answers='sqrt(1 - cos(x)^2)',
+               variables=['x'],
+               sample_from={'x': [0, np.pi]},
+               blacklist=['sin']),
+          'sqrt(1 - cos(x)^2)', id='blacklist'),
+    param(dict(answers='sin(x)/cos(x)', variables=['x'], whitelist=['sin', 'cos']),
+          'sin(x)/cos(x)', id='whitelist'),
+    param(dict(answers='pi/2-x', variables=['x'], whitelist=[None]),
+          'pi/2-x', id='whitelist_none'),
+    param(dict(answers='2*sin(theta)*cos(theta)',
+               variables=['theta'],
+               required_functions=['sin', 'cos']),
+          '2*sin(theta)*cos(theta)', id='required_functions'),
+    param(dict(answers='x*x', variables=['x'], user_functions={'f': lambda x: x*x}),
+          'x^2', id='user_functions'),
+    param(dict(answers="f''(x)", variables=['x'], user_functions={"f''": lambda x: x*x}),
+          "f''(x)", id='primed_function'),
+    param(dict(answers="x^2",
+               variables=['x'],
+               user_functions={"sin": lambda x: x*x},
+               suppress_warnings=True),
+          'sin(x)', id='override_function'),
+    param(dict(answers="f(x)", variables=['x'], user_functions={"f": [np.sin, np.cos]}),
+          'f(x)', id='specific_functions'),
+    param(dict(answers="f''(x) + omega^2*f(x)",
+               variables=['x', 'omega'],
+               user_functions={
+                   "f": RandomFunction(),
+                   "f''": RandomFunction()
+               }),
+          "f''(x)+omega^2*f(x)", id='random_functions'),
+    param(dict(answers='1/sqrt(1-v^2/c^2)', variables=['v'], user_constants={'c': 3e8}),
+          '1/sqrt(1-v^2/c^2)', id='user_constants'),
+    param(dict(answers='2*sin(theta)*cos(theta)',
+               variables=['theta'],
+               forbidden_strings=['*theta', 'theta*', 'theta/', '+theta',
+                                  'theta+', '-theta', 'theta-'],
+               forbidden_message="Your answer should only use trigonometric functions "
+                                 "acting on theta, not multiples of theta"),
+          '2*sin(theta)*cos(theta)', id='forbidden_strings'),
+    param(dict(answers='2*sin(theta)*cos(theta)', variables=['theta'], tolerance=0.00001),
+          '2*sin(theta)*cos(theta)', id='tolerance'),
+]
+
+@mark.parametrize('config, student_input', DOCS_EXAMPLES)
+def test_docs(config, student_input):
     """Test that the documentation examples work as expected"""
-    grader = FormulaGrader(
-        answers='1+x^2+y',
-        variables=['x', 'y']
-    )
-    assert grader(None, '1+x^2+y')['ok']
-
-    grader = FormulaGrader(
-        answers='1+x^2+y+z/2',
-        variables=['x', 'y', 'z'],
-        sample_from={
-            'x': ComplexRectangle(),
-            'y': [2, 6],
-            'z': (1, 3, 4, 8)
-        }
-    )
-    assert grader(None, '1+x^2+y+z/2')['ok']
-
-    grader = FormulaGrader(
-        answers='a_{0} + a_{1}*x + 1/2*a_{2}*x^2',
-        variables=['x'],
-        numbered_vars=['a'],
-        sample_from={
-            'x': [-5, 5],
-            'a': [-10, 10]
-        }
-    )
-    assert grader(None, 'a_{0} + a_{1}*x + 1/2*a_{2}*x^2')['ok']
-
-    grader = FormulaGrader(
-        answers='1+x^2',
-        variables=['x'],
-        samples=10
-    )
-    assert grader(None, '1+x^2')['ok']
-
-    grader = FormulaGrader(
-        answers='1+x^2',
-        variables=['x'],
-        samples=10,
-        failable_evals=1
-    )
-    assert grader(None, '1+x^2')['ok']
-
-    grader = FormulaGrader(
-        answers='abs(z)^2',
-        variables=['z'],
-        sample_from={
-            'z': ComplexRectangle()
-        }
-    )
-    assert grader(None, 'abs(z)^2')['ok']
-
-    grader = FormulaGrader(
-        answers='sqrt(1 - cos(x)^2)',
-        variables=['x'],
-        sample_from={'x': [0, np.pi]},
-        blacklist=['sin']
-    )
-    assert grader(None, 'sqrt(1 - cos(x)^2)')['ok']
-
-    grader = FormulaGrader(
-        answers='sin(x)/cos(x)',
-        variables=['x'],
-        whitelist=['sin', 'cos']
-    )
-    assert grader(None, 'sin(x)/cos(x)')['ok']
-
-    grader = FormulaGrader(
-        answers='pi/2-x',
-        variables=['x'],
-        whitelist=[None]
-    )
-    assert grader(None, 'pi/2-x')['ok']
-
-    grader = FormulaGrader(
-        answers='2*sin(theta)*cos(theta)',
-        variables=['theta'],
-        required_functions=['sin', 'cos']
-    )
-    assert grader(None, '2*sin(theta)*cos(theta)')['ok']
-
-    grader = FormulaGrader(
-        answers='x*x',
-        variables=['x'],
-        user_functions={'f': lambda x: x*x}
-    )
-    assert grader(None, 'x^2')['ok']
-
-    grader = FormulaGrader(
-        answers="f''(x)",
-        variables=['x'],
-        user_functions={"f''": lambda x: x*x}
-    )
-    assert grader(None, "f''(x)")['ok']
-
-    grader = FormulaGrader(
-        answers="x^2",
-        variables=['x'],
-        user_functions={"sin": lambda x: x*x},
-        suppress_warnings=True
-    )
-    assert grader(None, 'sin(x)')['ok']
-
-    grader = FormulaGrader(
-        answers="f(x)",
-        variables=['x'],
-        user_functions={"f": [np.sin, np.cos]}
-    )
-    assert grader(None, 'f(x)')['ok']
-
-    grader = FormulaGrader(
-        answers="f''(x) + omega^2*f(x)",
-        variables=['x', 'omega'],
-        user_functions={
-            "f": RandomFunction(),
-            "f''": RandomFunction()
-        }
-    )
-    assert grader(None, "f''(x)+omega^2*f(x)")['ok']
-
-    grader = FormulaGrader(
-        answers='1/sqrt(1-v^2/c^2)',
-        variables=['v'],
-        user_constants={
-            'c': 3e8
-        }
-    )
-    assert grader(None, '1/sqrt(1-v^2/c^2)')['ok']
-
-    grader = FormulaGrader(
-        answers='2*sin(theta)*cos(theta)',
-        variables=['theta'],
-        forbidden_strings=['*theta', 'theta*', 'theta/', '+theta', 'theta+', '-theta', 'theta-'],
-        forbidden_message="Your answer should only use trigonometric functions acting on theta, not multiples of theta"
-    )
-    assert grader(None, '2*sin(theta)*cos(theta)')['ok']
-
-    grader = FormulaGrader(
-        answers='2*sin(theta)*cos(theta)',
-        variables=['theta'],
-        tolerance=0.00001
-    )
-    assert grader(None, '2*sin(theta)*cos(theta)')['ok']
+    grader = FormulaGrader(**config)
+    assert grader(None, student_input)['ok']
 
+def test_docs_multiple_inputs():
+    """Test the documentation examples that check several inputs"""
     grader = FormulaGrader(
         answers='2*m',
         variables=['m'],
@@ -942,6 +866,20 @@ def test_empty_input():
     grader = FormulaGrader(answers="1")
     assert not grader(None, '')['ok']
 
+def test_empty_comparer_params():
+    """Make sure that empty answers and comparer_params evaluate to nan rather than crash"""
+    grader = FormulaGrader(answers='')
+    assert not grader(None, '1')['ok']
+
+    def params_are_nan_and_one(comparer_params_eval, student_eval, utils):
+        nan, one = comparer_params_eval
+        return nan != nan and one == 1 and student_eval == 1
+
+    grader = FormulaGrader(
+        answers={'comparer_params': ['', '1'], 'comparer': params_are_nan_and_one}
+    )
+    assert grader(None, '1')['ok']
+
 def test_errors():
     """
     Test unhandled error catching.
@@ -976,23 +914,53 @@ def test_whitespace_stripping():
     )
     assert grader(None, 'x_{a b}')['ok']
 
-def test_default_comparer():
-    """Tests setting and resetting default_comparer"""
-
+@fixture
+def silly_default_comparer():
+    """
+    Sets FormulaGrader's default comparer to a comparer that accepts 1 for
+    the duration of a test, resetting it afterwards even if the test fails.
+    """
     def silly_comparer(comparer_params_eval, student_eval, utils):
         return utils.within_tolerance(1, student_eval)
 
-    FormulaGrader.set_default_comparer(silly_comparer)
-    silly_grader = FormulaGrader(answers='pi')
+    with FormulaGrader.use_default_comparer(silly_comparer):
+        yield silly_comparer
+
+def test_default_comparer(silly_default_comparer):
+    """Tests setting and resetting default_comparer"""
+    silly_grader = FormulaGrader(answers='pi', samples=1)
     FormulaGrader.reset_default_comparer()
-    grader = FormulaGrader(answers='pi')
+    grader = FormulaGrader(answers='pi', samples=1)
 
-    silly_grader.config['answers'][0]['expect'][0]['comparer'] is silly_comparer
+    assert silly_grader.config['answers'][0]['expect'][0]['comparer'] is silly_default_comparer
     assert silly_grader(None, '1')['ok']
-    grader.config['answers'][0]['expect'][0]['comparer'] is equality_comparer
+    assert grader.config['answers'][0]['expect'][0]['comparer'] is equality_comparer
     assert not grader(None, '1')['ok']
     assert grader(None, '3.141592653')['ok']
 
+def test_use_default_comparer():
+    """Tests that use_default_comparer restores the previous default comparer"""
+    def silly_comparer(comparer_params_eval, student_eval, utils):
+        return utils.within_tolerance(1, student_eval)
+
+    # NumericalGrader defines its own default_comparer
+    with NumericalGrader.use_default_comparer(silly_comparer):
+        assert NumericalGrader.default_comparer is silly_comparer
+        assert FormulaGrader.default_comparer is equality_comparer
+    assert NumericalGrader.default_comparer is equality_comparer
+
+    # Subclasses without their own default_comparer go back to inheriting it,
+    # even if an error is raised inside the with block
+    class SubGrader(FormulaGrader):
+        pass
+
+    with raises(ValueError):
+        with SubGrader.use_default_comparer(silly_comparer):
+            assert SubGrader(answers='pi', samples=1)(None, '1')['ok']
+            raise ValueError
+    assert 'default_comparer' not in SubGrader.__dict__
+    assert SubGrader.default_comparer is equality_comparer
+
 def test_instructor_vars():
     """Ensures that instructor variables are not available to students"""
     grader = FormulaGrader(
@@ -1,7 +1,7 @@
 
 
 import re
-from pytest import raises
+from pytest import raises, fixture, mark, param
 from mitxgraders import (MatrixGrader, RealMatrices, RealVectors, ComplexRectangle)
 from mitxgraders.formulagrader.matrixgrader import InputTypeError
 from mitxgraders.helpers.calc.exceptions import (
@@ -43,8 +43,10 @@ def test_max_array_dim():
     )
     assert grader(None, "[[1, 2, 3]]")['ok']
 
-def test_fg_with_arrays():
-    grader = MatrixGrader(
+@fixture(scope='module')
+def array_grader():
+    """A MatrixGrader with matrix, vector and scalar variables"""
+    return MatrixGrader(
         answers='x*A*B*u + z*C^3*v/(u*C*v)',
         variables=['A', 'B', 'C', 'u', 'v', 'z', 'x'],
         sample_from={
@@ -58,33 +60,33 @@ def test_fg_with_arrays():
         identity_dim=2
     )
 
-    correct_0 = 'x*A*B*u + z*C^3*v/(u*C*v)'
-    correct_1 = 'z*C^3*v/(u*C*v) + x*A*B*u'
-    correct_2 = '(1/16)* z*(2*I)*(2*C)^3*v/(u*C*v) + x*A*B*u'
-    correct_3 = '(1/16)* z*(2*I)*(2*C)^3*v/(v*trans(C)*u) + x*A*B*u/2 + 0.5*x*A*B*u'
-
-    assert grader(None, correct_0)['ok']
-    assert grader(None, correct_1)['ok']
-    assert grader(None, correct_2)['ok']
-    assert grader(None, correct_3)['ok']
-
-    match = r"Cannot multiply a matrix of shape \(rows: 3, cols: 2\) with a matrix of shape \(rows: 3, cols: 2\)"
-    with raises(ShapeError, match=match):
-        grader(None, 'B*B')
-
-    match = "Cannot raise a non-square matrix to powers."
-    with raises(ShapeError, match=match):
-        grader(None, 'B^2')
-
-    match = "Cannot add/subtract scalars to a matrix."
-    with raises(ShapeError, match=match):
-        grader(None, 'B + 5')
-
-    match = (r"There was an error evaluating function sin\(...\)<br/>"
-             r"1st input has an error: received a matrix of shape "
-             r"\(rows: 3, cols: 2\), expected a scalar")
-    with raises(DomainError, match=match):
-        grader(None, 'sin(B)')
+@mark.parametrize('student_input', [
+    'x*A*B*u + z*C^3*v/(u*C*v)',
+    'z*C^3*v/(u*C*v) + x*A*B*u',
+    '(1/16)* z*(2*I)*(2*C)^3*v/(u*C*v) + x*A*B*u',
+    '(1/16)* z*(2*I)*(2*C)^3*v/(v*trans(C)*u) + x*A*B*u/2 + 0.5*x*A*B*u',
+])
+def test_fg_with_arrays(array_grader, student_input):
+    assert array_grader(None, student_input)['ok']
+
+@mark.parametrize('student_input, error, match', [
+    param('B*B', ShapeError,
+          r"Cannot multiply a matrix of shape \(rows: 3, cols: 2\) with a matrix of "
+          r"shape \(rows: 3, cols: 2\)",
+          id='bad-product'),
+    param('B^2', ShapeError, "Cannot raise a non-square matrix to powers.",
+          id='non-square-power'),
+    param('B + 5', ShapeError, "Cannot add/subtract scalars to a matrix.",
+          id='scalar-plus-matrix'),
+    param('sin(B)', DomainError,
+          r"There was an error evaluating function sin\(...\)<br/>"
+          r"1st input has an error: received a matrix of shape "
+          r"\(rows: 3, cols: 2\), expected a scalar",
+          id='matrix-in-scalar-function'),
+])
+def test_fg_with_arrays_errors(array_grader, student_input, error, match):
+    with raises(error, match=match):
+        array_grader(None, student_input)
 
 def test_shape_errors_false_grades_incorrect():
     grader0 = MatrixGrader(
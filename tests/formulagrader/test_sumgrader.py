@@ -1,6 +1,6 @@
 
 
-from pytest import raises
+from pytest import raises, fixture
 import platform
 import numpy as np
 from mitxgraders.version import __version__
@@ -605,8 +605,10 @@ def test_bad_numbered_var():
     with raises(ConfigError, match="Summation Error with author's stored answer: Invalid Input: 'c_{n}' not permitted in answer as a variable"):
         grader(None, ['0', '10', 'n', 'n'])
 
-def test_complex_limits():
-    grader = SumGrader(
+@fixture(scope='module')
+def grader_sum_t():
+    """A SumGrader expecting the sum of t from 0 to 1, shared by the limit error tests"""
+    return SumGrader(
         answers={
             'lower': '0',
             'upper': '1',
@@ -614,35 +616,21 @@ def test_complex_limits():
             'summation_variable': 't'
         }
     )
+
+def test_complex_limits(grader_sum_t):
     with raises(SummationError, match="Summation limits must be real but have evaluated to complex numbers."):
-        grader(None, ['0', '1+i', 'x', 'x'])
+        grader_sum_t(None, ['0', '1+i', 'x', 'x'])
     with raises(SummationError, match="Summation limits must be real but have evaluated to complex numbers."):
-        grader(None, ['1+i', '0', 'x', 'x'])
+        grader_sum_t(None, ['1+i', '0', 'x', 'x'])
 
-def test_noninteger_limits():
-    grader = SumGrader(
-        answers={
-            'lower': '0',
-            'upper': '1',
-            'summand': 't',
-            'summation_variable': 't'
-        }
-    )
+def test_noninteger_limits(grader_sum_t):
     with raises(SummationError, match="Upper summation limit does not evaluate to an integer."):
-        grader(None, ['0', '1/2', 'x', 'x'])
+        grader_sum_t(None, ['0', '1/2', 'x', 'x'])
     with raises(SummationError, match="Lower summation limit does not evaluate to an integer."):
-        grader(None, ['1/3', '0', 'x', 'x'])
+        grader_sum_t(None, ['1/3', '0', 'x', 'x'])
 
-def test_bad_inf_sums():
-    grader = SumGrader(
-        answers={
-            'lower': '0',
-            'upper': '1',
-            'summand': 't',
-            'summation_variable': 't'
-        }
-    )
+def test_bad_inf_sums(grader_sum_t):
     with raises(SummationError, match="Cannot sum from infty to infty."):
-        grader(None, ['infty', 'infty', 'x', 'x'])
+        grader_sum_t(None, ['infty', 'infty', 'x', 'x'])
     with raises(SummationError, match="Cannot sum from -infty to -infty."):
-        grader(None, ['-infty', '-infty', 'x', 'x'])
+        grader_sum_t(None, ['-infty', '-infty', 'x', 'x'])
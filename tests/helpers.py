@@ -1,7 +1,7 @@
 
 
 import re
-from functools import wraps
+from functools import wraps, lru_cache
 
 def log_results(results):
     """
@@ -49,10 +49,20 @@ def round_decimals_in_string(string, round_to=6):
 
     Note that the final occurrence of 1.000 was not rounded.
     """
-    pattern = r"([0-9]\.[0-9]{{{round_to}}}[0-9]+)".format(round_to=round_to)
+    formatter = "{{0:.{round_to}f}}".format(round_to=round_to)
     def replacer(match):
-        number = float(match.group(1))
-        formatter = "{{0:.{round_to}f}}".format(round_to=round_to)
-        return formatter.format(number)
+        return formatter.format(float(match.group(1)))
 
-    return re.sub(pattern, replacer, string)
+    return decimals_regexp(round_to).sub(replacer, string)
+
+@lru_cache(maxsize=None)
+def decimals_regexp(round_to):
+    """
+    Compiled regexp matching decimals with more than round_to places.
+
+    Usage
+    =====
+    >>> decimals_regexp(2) is decimals_regexp(2)
+    True
+    """
+    return re.compile(r"([0-9]\.[0-9]{{{round_to}}}[0-9]+)".format(round_to=round_to))
@@ -14,6 +14,7 @@ from mitxgraders.helpers.calc.exceptions import (
     ArgumentError, CalcOverflowError, CalcZeroDivisionError
 )
 from mitxgraders.helpers.calc.math_array import equal_as_arrays, MathArray
+from mitxgraders.helpers.calc.expressions import MathParser
 
 def test_expressions_py():
     """Tests of expressions.py that aren't covered elsewhere"""
@@ -211,6 +212,10 @@ def test_inf_overflow():
     msg = r"Numerical overflow occurred. Does your expression generate very large numbers\?"
     with raises(CalcOverflowError, match=msg):
         evaluator("f(1)", functions=functions,)
+    # Including when the infinity is inside an array
+    variables = {'v': MathArray([1, float('inf')])}
+    with raises(CalcOverflowError, match=msg):
+        evaluator("2*v", variables=variables)
 
 def test_div_by_zero():
     """Test that division by zero is caught"""
@@ -281,3 +286,16 @@ def test_large_numbers():
 
 def test_nan():
     assert np.isnan(evaluator("x^2", {'x': float('nan')}, {}, {})[0])
+    assert np.isnan(evaluator("2*v", {'v': MathArray([1, float('nan')])}, {}, {})[0])
+    assert np.isnan(evaluator("x^2", {'x': complex(1, float('nan'))}, {}, {})[0])
+
+def test_parser_cache_is_bounded():
+    parser = MathParser()
+    parser.cache_size = 2
+    first = parser.parse('x+1')
+    parser.parse('x+2')
+    # Reusing 'x+1' makes 'x+2' the least recently used entry
+    assert parser.parse('x + 1') is first
+    parser.parse('x+3')
+    assert list(parser.cache) == ['x+1', 'x+3']
+    assert parser.parse('x+1') is first
@@ -2,8 +2,11 @@
 Tests for StringGrader
 """
 
+import re
+from unittest import mock
 from pytest import raises
 from mitxgraders import StringGrader
+from mitxgraders.stringgrader import compile_pattern
 from mitxgraders.exceptions import ConfigError, InvalidInput
 
 def test_strip():
@@ -55,6 +58,11 @@ def test_case():
     assert not grader(None, "Cat")['ok']
     assert grader(None, "CAT")['ok']
 
+    grader = StringGrader(answers="Straße", case_sensitive=False)
+    assert grader(None, "STRASSE")['ok']
+    assert grader(None, "strasse")['ok']
+    assert grader(None, "straße")['ok']
+
 def test_any():
     """Tests that accept_any is working correctly"""
     grader = StringGrader(accept_any=True)
@@ -62,6 +70,14 @@ def test_any():
     assert grader(None, "dog")['ok']
     assert grader(None, "")['ok']
     assert grader(None, " ")['ok']
+    assert grader.accept_everything
+    # Nothing is cleaned when every response is acceptable
+    answer = {'expect': '', 'ok': True, 'grade_decimal': 1, 'msg': 'Yes'}
+    assert grader.grade_response(answer, None) == {'ok': True, 'grade_decimal': 1, 'msg': 'Yes'}
+
+    grader = StringGrader(accept_any=True, min_words=1, explain_minimums=None)
+    assert not grader.accept_everything
+    assert not grader(None, " ")['ok']
 
 def test_nonempty():
     """Tests that accept_nonempty is working correctly"""
@@ -140,6 +156,16 @@ def test_clean():
                           clean_spaces=True)
     assert grader.clean_input(teststring) == "Hello there!"
 
+def test_clean_whitespace():
+    """Test that tabs and newlines are converted to spaces by clean_input"""
+    grader = StringGrader(strip=False, clean_spaces=False)
+    assert grader.clean_input("a\tb") == "a b"
+    assert grader.clean_input("a\nb") == "a b"
+    assert grader.clean_input("a\rb") == "a b"
+    assert grader.clean_input("a\r\nb") == "a b"
+    assert grader.clean_input("a\n\rb") == "a b"
+    assert grader.clean_input("\ta\n\nb\r") == " a  b "
+
 def test_min_length():
     """Make sure that minimum lengths are graded correctly"""
     grader = StringGrader(accept_any=True, min_length=2, explain_minimums='err')
@@ -157,6 +183,14 @@ def test_min_length():
     grader = StringGrader(accept_any=True, min_length=2, explain_minimums=None)
     assert grader(None, 'c') == {'ok': False, 'grade_decimal': 0, 'msg': ''}
 
+    # Lengths are measured before casefolding, which turns 'ß' into 'ss'
+    grader = StringGrader(accept_any=True, min_length=2, case_sensitive=False,
+                          explain_minimums='msg')
+    assert grader(None, '\u00df') == {'ok': False,
+                                      'grade_decimal': 0,
+                                      'msg': 'Your response is too short (1/2 characters)'}
+    assert not grader(None, '\ufb01')['ok']
+
 def test_min_words():
     """Make sure that minimum wordcounts are graded correctly"""
     grader = StringGrader(accept_any=True, min_words=3, explain_minimums='err')
@@ -224,9 +258,155 @@ def test_validation():
     with raises(InvalidInput, match=expect):
         grader(None, '1')
 
-    grader = StringGrader(answers="10)",
-                          validation_pattern=r"\([0-9]+\)")
     # Oh escaping hell...
     expect = r"The provided answer '10\)' does not match the validation pattern '\\\(\[0-9\]\+\\\)'"
     with raises(ConfigError, match=expect):
-        grader(None, '1')
+        StringGrader(answers="10)", validation_pattern=r"\([0-9]+\)")
+
+    # Inferred answers are also checked against the pattern
+    grader = StringGrader(validation_pattern=r"\([0-9]+\)")
+    assert grader('(10)', '(10)')['ok']
+    with raises(ConfigError, match=expect):
+        grader('10)', '(10)')
+
+    # Answers are irrelevant when accepting anything
+    grader = StringGrader(answers="10)", validation_pattern=r"\([0-9]+\)", accept_any=True)
+    assert grader(None, '(10)')['ok']
+
+    # Answers are only checked once when the grader is created
+    with mock.patch.object(StringGrader, 'post_schema_ans_val',
+                           autospec=True, side_effect=lambda self, answers: answers) as check:
+        StringGrader(answers="(10)", validation_pattern=r"\([0-9]+\)")
+    assert check.call_count == 1
+
+    expect = r"Unable to compile the validation pattern '\(\[0-9\]\+': .*"
+    with raises(ConfigError, match=expect):
+        StringGrader(answers="(10)", validation_pattern=r"([0-9]+")
+
+def test_validation_pattern_compiled():
+    """Make sure that the validation pattern is compiled once at construction"""
+    grader = StringGrader(answers="cat")
+    assert grader.validation_re is None
+
+    grader = StringGrader(answers="(10)", validation_pattern=r"\([0-9]+\)")
+    assert grader.validation_re.pattern == r"\([0-9]+\)$"
+    assert grader.validation_re.match('(10)')
+    assert not grader.validation_re.match('(10)a')
+    assert grader.matches_pattern == grader.matches_validation_re
+
+def test_simple_validation_patterns():
+    """Make sure that simple validation patterns are checked without regex"""
+    grader = StringGrader(answers="yes", validation_pattern=r"^(yes|no)$",
+                          explain_validation=None)
+    assert grader.matches_pattern != grader.matches_validation_re
+    assert grader(None, 'yes')['ok']
+    assert not grader(None, 'no')['ok']
+    assert grader(None, 'maybe') == {'ok': False, 'grade_decimal': 0, 'msg': ''}
+    with raises(ConfigError, match="The provided answer 'yess' does not match"):
+        StringGrader(answers="yess", validation_pattern=r"^(yes|no)$")
+
+    grader = StringGrader(accept_any=True, validation_pattern=r"\d+",
+                          explain_validation=None)
+    assert grader(None, '123')['ok']
+    assert grader(None, '\u0663')['ok']  # Arabic-indic digit three
+    assert not grader(None, '')['ok']
+    assert not grader(None, '12 3')['ok']
+
+    grader = StringGrader(accept_any=True, validation_pattern=r"[0-9]+",
+                          explain_validation=None)
+    assert grader(None, '123')['ok']
+    assert not grader(None, '\u0663')['ok']
+
+def test_compile_pattern():
+    """Make sure that RE2 is used when available, falling back to re as needed"""
+    with mock.patch('mitxgraders.stringgrader.re2', None):
+        assert compile_pattern(r'[0-9]+$') == re.compile(r'[0-9]+$')
+
+    class FakeRE2(object):
+        """Stands in for the re2 module, but only supports patterns without lookarounds"""
+        error = ValueError
+
+        @staticmethod
+        def compile(pattern):
+            if '(?' in pattern:
+                raise ValueError('Unsupported pattern')
+            return ('re2', pattern)
+
+    with mock.patch('mitxgraders.stringgrader.re2', FakeRE2):
+        assert compile_pattern(r'[0-9]+$') == ('re2', r'[0-9]+$')
+        assert compile_pattern(r'(?!x)[a-z]+$') == re.compile(r'(?!x)[a-z]+$')
+        # Unicode-sensitive character classes stay with re
+        assert compile_pattern(r'\d+ [a-z]+$') == re.compile(r'\d+ [a-z]+$')
+        assert compile_pattern(r'\\d+$') == ('re2', r'\\d+$')
+
+def test_validation_pattern_unicode_with_re2():
+    """Make sure that installing RE2 doesn't change which inputs pass validation"""
+    class ASCIIRE2(object):
+        """Stands in for the re2 module, matching \\d, \\w and \\s against ASCII only"""
+        error = re.error
+
+        @staticmethod
+        def compile(pattern):
+            return re.compile(pattern, re.ASCII)
+
+    def grade(student_input):
+        grader = StringGrader(accept_any=True, validation_pattern=r'\w+ \d+ \w+',
+                              explain_validation=None)
+        return grader(None, student_input)['ok']
+
+    inputs = ['caf\u00e9 \u0663 ok', 'cafe 3 ok', 'cafe three ok']
+    with mock.patch('mitxgraders.stringgrader.re2', None):
+        without_re2 = [grade(student_input) for student_input in inputs]
+    with mock.patch('mitxgraders.stringgrader.re2', ASCIIRE2):
+        with_re2 = [grade(student_input) for student_input in inputs]
+    assert without_re2 == with_re2 == [True, True, False]
+
+def test_expect_cache():
+    """Make sure that cleaned answers are cached and the cache stays bounded"""
+    grader = StringGrader(answers=("  Cat ", "dog"), case_sensitive=False)
+    assert grader(None, 'cat')['ok']
+    assert grader.cleaned_expect_cache == {"  Cat ": "cat", "dog": "dog"}
+    assert grader(None, 'DOG')['ok']
+    assert not grader(None, 'cow')['ok']
+
+    grader = StringGrader(case_sensitive=False)
+    grader.expect_cache_size = 2
+    assert grader('One', 'one')['ok']
+    assert grader('Two', 'two')['ok']
+    assert len(grader.cleaned_expect_cache) == 2
+    assert grader('Three', 'three')['ok']
+    assert grader.cleaned_expect_cache == {'Three': 'three'}
+
+def test_result_cache():
+    """Make sure that grading results are cached, and are safe to modify"""
+    grader = StringGrader(answers=({'expect': 'cat', 'msg': 'Meow'}, 'dog'),
+                          wrong_msg='Nope')
+    assert grader(None, 'cat') == {'ok': True, 'grade_decimal': 1, 'msg': 'Meow'}
+    assert grader(None, 'cow') == {'ok': False, 'grade_decimal': 0, 'msg': 'Nope'}
+    assert len(grader.result_cache) == 4
+    # wrong_msg is added to the returned result, not the cached one
+    assert all(result['msg'] != 'Nope' for result in grader.result_cache.values())
+    assert grader(None, 'cat') == {'ok': True, 'grade_decimal': 1, 'msg': 'Meow'}
+    assert len(grader.result_cache) == 4
+
+    # Errors are not cached
+    grader = StringGrader(accept_any=True, min_length=2)
+    with raises(InvalidInput):
+        grader(None, 'c')
+    assert not grader.result_cache
+
+    # Inputs that are equal as dictionary keys are graded separately
+    grader = StringGrader(answers='1')
+    assert not grader.check(None, True)['ok']
+    assert grader.check(None, 1)['ok']
+    assert not grader.check(None, 1.0)['ok']
+
+    grader = StringGrader(answers='cat')
+    grader.result_cache_size = 2
+    grader(None, 'cat')
+    grader(None, 'cow')
+    assert len(grader.result_cache) == 2
+    # Using 'cat' again makes 'cow' the least recently used result
+    grader(None, 'cat')
+    grader(None, 'dog')
+    assert [key[-1] for key in grader.result_cache] == ['cat', 'dog']